@@ -0,0 +1,81 @@
+# Бот ҳангоми import пойгоҳ, Bot ва Dispatcher-ро месозад, бинобар ин муҳит пеш аз import танзим мешавад.
+# Пешфарз SQLite-и муваққатӣ; TEST_DATABASE_URL (масалан PostgreSQL-и маҳаллӣ дар CI) онро иваз мекунад.
+import asyncio
+import itertools
+import os
+import sys
+import tempfile
+from uuid import uuid4
+
+import pytest
+
+WORKDIR = tempfile.mkdtemp(prefix="chocoberry-test-")
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", f"sqlite:///{os.path.join(WORKDIR, 'chocoberry.db')}")
+os.environ.setdefault("BOT_TOKEN", "123456:TEST")
+os.environ["ADMIN_ID"] = "1"
+os.environ["GROUP_CHAT_ID"] = "-100"
+os.environ["METRICS_PORT"] = "0"
+os.environ.pop("UPDATE_RECORD_PATH", None)
+# Навбати ирсол дар ҳамаи тестҳо кор мекунад, вале бо суръати баланд интизорӣ илова намекунад
+for name in ("SEND_RATE", "CHAT_SEND_RATE", "GROUP_SEND_RATE"):
+    os.environ[name] = "10000"
+os.environ["CHAT_SEND_BURST"] = "100"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "tools")]
+
+import chocoberry_bot as cb  # noqa: E402
+from aiogram import types  # noqa: E402
+from testkit import install_fake_session  # noqa: E402
+
+user_ids = itertools.count(200000)
+
+
+@pytest.fixture(scope="session")
+def run():
+    # Ҳамаи тестҳо як event loop доранд, чунки қулфҳои модули бот ба loop-и аввал баста мешаванд
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    # Вазифаҳои фонӣ (масалан коргари навбати ирсол) пеш аз бастани loop бекор карда мешаванд
+    pending = asyncio.all_tasks(loop)
+    for task in pending:
+        task.cancel()
+    loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    loop.close()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def api_session():
+    return install_fake_session(cb)
+
+
+@pytest.fixture
+def feed(run):
+    async def feed_all(updates):
+        return await asyncio.gather(*(cb.dp.feed_raw_update(cb.bot, update) for update in updates))
+
+    # Update-ҳо ҳамзамон коркард мешаванд, мисли polling бо handle_as_tasks ё webhook
+    def feed(*updates):
+        return run(feed_all(updates))
+
+    return feed
+
+
+@pytest.fixture
+def user_id():
+    user_id = next(user_ids)
+    with cb.Session() as session:
+        cb.register_user(session, types.User(id=user_id, is_bot=False, first_name=f"User{user_id}"))
+        cb.save_profile(session, user_id, "900000000", "Dushanbe")
+    return user_id
+
+
+@pytest.fixture
+def make_product():
+    def make_product(price_cents: int) -> int:
+        with cb.Session() as session:
+            category = cb.add_and_commit(session, cb.Category(name=f"Category {uuid4().hex[:8]}"))
+            product = cb.add_and_commit(session, cb.Product(name="Product", price_cents=price_cents, category_id=category.id))
+        cb.invalidate_catalog()
+        return product.id
+
+    return make_product
@@ -0,0 +1,18 @@
+# Ёрдамчиҳои тестҳо: шумориши SQL-и иҷрошуда (update-ҳо ва Bot-и сохта дар tools/testkit.py)
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+@contextmanager
+def capture_statements(engine):
+    statements = []  # (SQL, параметрҳо)
+
+    def before_cursor_execute(connection, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
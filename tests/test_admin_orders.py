@@ -0,0 +1,21 @@
+import chocoberry_bot as cb
+
+
+def test_admin_orders_open_on_the_latest_orders(user_id):
+    with cb.Session() as session:
+        orders = [cb.OrderHeader(telegram_id=user_id, subtotal_cents=100, total_cents=100) for _ in range(cb.ADMIN_ORDERS_PAGE_SIZE + 2)]
+        session.add_all(orders)
+        session.commit()
+        latest = [order_id for order_id, in session.query(cb.OrderHeader.id).order_by(cb.OrderHeader.id.desc())]
+
+    with cb.Session() as session:
+        first, _ = cb.load_admin_orders_page(session, "all", "admin_orders_all")
+        assert [order.id for order in first.rows] == latest[:cb.ADMIN_ORDERS_PAGE_SIZE]
+        assert first.prev_cursor is None
+
+        second, _ = cb.load_admin_orders_page(session, "all", f"admin_orders_all:{first.next_cursor}")
+        assert [order.id for order in second.rows] == latest[cb.ADMIN_ORDERS_PAGE_SIZE:cb.ADMIN_ORDERS_PAGE_SIZE * 2]
+
+        back, _ = cb.load_admin_orders_page(session, "all", f"admin_orders_all:{second.prev_cursor}")
+        assert [order.id for order in back.rows] == [order.id for order in first.rows]
+        assert back.prev_cursor is None
@@ -0,0 +1,51 @@
+import chocoberry_bot as cb
+from helpers import capture_statements
+from testkit import callback_update
+
+
+def test_cart_render_is_one_statement(user_id, make_product):
+    with cb.Session() as session:
+        for product_id in (make_product(1000), make_product(2550), make_product(2550)):
+            cb.add_product_to_cart(session, user_id, product_id)
+
+    with cb.Session() as session, capture_statements(cb.engine) as statements:
+        view = cb.load_cart_view(session, user_id)
+        response, keyboard = cb.render_cart(view)
+
+    assert len(statements) == 1
+    assert len(view.items) == 3
+    assert "61.00" in response
+    assert len(keyboard.inline_keyboard) == 3 + 2
+
+
+def cart_state(user_id: int) -> tuple:
+    with cb.Session() as session:
+        lines = session.query(cb.Cart.quantity, cb.Product.price_cents).join(cb.Product).filter(cb.Cart.telegram_id == user_id).all()
+        return sum(quantity * price for quantity, price in lines), session.get(cb.User, user_id).cart_total_cents, lines
+
+
+def test_parallel_add_to_cart_keeps_total(user_id, make_product, feed):
+    product_id = make_product(100)
+    feed(*(callback_update(user_id, f"add_to_cart_{product_id}") for _ in range(8)))
+
+    lines_total, cached_total, lines = cart_state(user_id)
+    assert [quantity for quantity, _ in lines] == [8]
+    assert lines_total == cached_total == 800
+
+
+def test_parallel_quantity_taps_keep_total(user_id, make_product, feed):
+    product_id = make_product(250)
+    with cb.Session() as session:
+        cb.add_product_to_cart(session, user_id, product_id)
+        cart_id = session.query(cb.Cart.id).filter_by(telegram_id=user_id).scalar()
+
+    feed(*(callback_update(user_id, f"increase_quantity_{cart_id}") for _ in range(6)))
+    feed(*(callback_update(user_id, f"decrease_quantity_{cart_id}") for _ in range(3)))
+    lines_total, cached_total, lines = cart_state(user_id)
+    assert [quantity for quantity, _ in lines] == [4]
+    assert lines_total == cached_total == 1000
+
+    feed(*(callback_update(user_id, f"decrease_quantity_{cart_id}") for _ in range(6)))
+    lines_total, cached_total, lines = cart_state(user_id)
+    assert lines == []
+    assert lines_total == cached_total == 0
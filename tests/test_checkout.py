@@ -0,0 +1,56 @@
+import chocoberry_bot as cb
+from aiogram.methods import SendMessage
+from testkit import callback_update
+
+
+def test_parallel_payment_taps_create_one_order(user_id, make_product, feed, api_session):
+    cake, drink = make_product(1000), make_product(550)
+    with cb.Session() as session:
+        for product_id in (cake, cake, drink):
+            cb.add_product_to_cart(session, user_id, product_id)
+        cb.lock_cashback(session, user_id).amount_cents = 500
+        session.commit()
+        outbox_before = session.query(cb.OutboxMessage).count()
+
+    feed(callback_update(user_id, "confirm_order"))
+    feed(callback_update(user_id, "apply_cashback"))
+    calls_before = len(api_session.calls)
+    feed(*(callback_update(user_id, "payment_cash") for _ in range(6)))
+
+    with cb.Session() as session:
+        orders = session.query(cb.OrderHeader).filter_by(telegram_id=user_id).all()
+        assert len(orders) == 1
+        order = orders[0]
+        assert (order.subtotal_cents, order.cashback_applied_cents, order.total_cents) == (2550, 500, 2050)
+        assert order.cashback_earned_cents == cb.earned_cashback(2050)
+        assert len(order.lines) == 2
+        assert session.get(cb.Cashback, user_id).amount_cents == cb.earned_cashback(2050)
+        assert session.query(cb.Cart).filter_by(telegram_id=user_id).count() == 0
+        assert session.get(cb.User, user_id).cart_total_cents == 0
+        assert session.query(cb.OutboxMessage).count() == outbox_before + 1
+
+    confirmed = cb.translate("tj", "order_confirmed")
+    confirmations = [
+        call for call in api_session.calls[calls_before:]
+        if isinstance(call, SendMessage) and call.text.startswith(confirmed)
+    ]
+    assert len(confirmations) == 1
+
+
+def test_cart_cashback_button_spends_cashback_only_with_the_order(user_id, make_product, feed):
+    cake = make_product(1000)
+    with cb.Session() as session:
+        cb.add_product_to_cart(session, user_id, cake)
+        cb.lock_cashback(session, user_id).amount_cents = 300
+        session.commit()
+
+    feed(callback_update(user_id, "use_cashback"))
+    with cb.Session() as session:
+        assert session.get(cb.Cashback, user_id).amount_cents == 300
+        assert session.query(cb.OrderHeader).filter_by(telegram_id=user_id).count() == 0
+
+    feed(callback_update(user_id, "payment_card"))
+    with cb.Session() as session:
+        order, = session.query(cb.OrderHeader).filter_by(telegram_id=user_id).all()
+        assert (order.subtotal_cents, order.cashback_applied_cents, order.total_cents) == (1000, 300, 700)
+        assert session.get(cb.Cashback, user_id).amount_cents == cb.earned_cashback(700)
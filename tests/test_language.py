@@ -0,0 +1,30 @@
+import asyncio
+
+import chocoberry_bot as cb
+from helpers import capture_statements
+from testkit import message_update
+
+
+def test_start_caches_language_of_new_user(feed):
+    user_id = 300001
+    feed(message_update(user_id, "/start"))
+    misses = cb.language_cache_stats["misses"]
+
+    assert cb.get_user_language(user_id) == "tj"
+    assert cb.language_cache_stats["misses"] == misses
+
+
+def test_cache_miss_does_not_query_on_event_loop(run, user_id):
+    with cb.Session() as session:
+        cb.save_language(session, user_id, "en")
+    cb._language_cache.pop(user_id, None)
+
+    async def miss():
+        with capture_statements(cb.engine) as statements:
+            language = cb.get_user_language(user_id)
+            queried_inline = len(statements)
+        await asyncio.gather(*cb._language_load_tasks)
+        return language, queried_inline
+
+    assert run(miss()) == ("tj", 0)
+    assert cb.get_user_language(user_id) == "en"
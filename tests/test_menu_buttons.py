@@ -0,0 +1,38 @@
+import chocoberry_bot as cb
+from aiogram.methods import SendMessage
+from testkit import callback_update, message_update
+
+
+def state_of(run, user_id: int):
+    return run(cb.dp.fsm.get_context(cb.bot, user_id, user_id).get_state())
+
+
+def replies(api_session, since: int) -> list:
+    return [call.text for call in api_session.calls[since:] if isinstance(call, SendMessage)]
+
+
+def test_menu_label_is_an_answer_while_a_form_is_active(run, feed, user_id, api_session):
+    feed(callback_update(user_id, "edit_profile"))
+    assert state_of(run, user_id) == cb.ProfileForm.phone.state
+
+    calls = len(api_session.calls)
+    feed(message_update(user_id, cb.translate("tj", "cart")))
+    assert state_of(run, user_id) == cb.ProfileForm.phone.state
+    # Матни тугма ба process_phone расид ва ҳамчун рақами нодуруст рад шуд
+    assert replies(api_session, calls) == [
+        cb.translate("tj", "invalid_phone", error="Рақами телефон бояд 9 рақам бошад (масалан, 900585249)! "
+                                                  "Лутфан бе +992 ворид кунед.")
+    ]
+    run(cb.dp.fsm.get_context(cb.bot, user_id, user_id).clear())
+
+
+def test_menu_button_works_during_checkout(run, feed, user_id, make_product, api_session):
+    with cb.Session() as session:
+        cb.add_product_to_cart(session, user_id, make_product(1000))
+    feed(callback_update(user_id, "confirm_order"))
+    assert state_of(run, user_id) == cb.OrderConfirmation.payment_method.state
+
+    calls = len(api_session.calls)
+    feed(message_update(user_id, cb.translate("tj", "cart")))
+    assert any(text.startswith("<b>🛒") for text in replies(api_session, calls))
+    run(cb.dp.fsm.get_context(cb.bot, user_id, user_id).clear())
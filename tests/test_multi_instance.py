@@ -0,0 +1,107 @@
+# Якчанд нусхаи бот бо як пойгоҳ: outbox бояд ҳар паёмро танҳо ба як нусха диҳад, ва тағйироти
+# каталог ё забон, ки нусхаи дигар сабт кардааст, бояд бо sync_caches ба кэшҳои ин нусха расад
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import chocoberry_bot as cb
+
+
+def add_outbox_messages(count: int) -> set:
+    with cb.Session() as session:
+        messages = [cb.OutboxMessage(chat_id="-100", text=f"order {index}") for index in range(count)]
+        session.add_all(messages)
+        session.commit()
+        return {message.id for message in messages}
+
+
+def claim(instance_id: str) -> set:
+    with cb.Session() as session:
+        return {message.id for message in cb.claim_outbox_batch(session, 1000, instance_id)}
+
+
+def expire_claims(message_ids: set):
+    with cb.Session() as session:
+        session.query(cb.OutboxMessage).filter(cb.OutboxMessage.id.in_(message_ids)).update(
+            {"next_attempt_at": datetime.utcnow() - timedelta(seconds=1)}, synchronize_session=False
+        )
+        session.commit()
+
+
+def test_outbox_message_is_claimed_by_one_instance():
+    message_ids = add_outbox_messages(10)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        claims = list(executor.map(claim, ["a", "b", "c", "d"]))
+
+    for index, claimed in enumerate(claims):
+        for other in claims[index + 1:]:
+            assert not claimed & other
+    assert message_ids <= set().union(*claims)
+    assert not message_ids & claim("e")
+
+
+def test_expired_claim_is_taken_over():
+    message_ids = add_outbox_messages(2)
+    assert message_ids <= claim("crashed")
+    expire_claims(message_ids)
+
+    assert message_ids <= claim("survivor")
+
+
+def test_expired_claim_cannot_renew_or_save_result():
+    message_id, = add_outbox_messages(1)
+    with cb.Session() as session:
+        stale, = cb.claim_outbox_batch(session, 1, "slow")
+    expire_claims({message_id})
+    with cb.Session() as session:
+        fresh, = [message for message in cb.claim_outbox_batch(session, 1000, "fast") if message.id == message_id]
+
+    with cb.Session() as session:
+        assert cb.renew_outbox_claim(session, message_id, stale.next_attempt_at, "slow") is None
+        assert not cb.save_outbox_result(session, message_id, stale.next_attempt_at, True, 0, "slow")
+        assert session.get(cb.OutboxMessage, message_id).sent_at is None
+
+        claimed_until = cb.renew_outbox_claim(session, message_id, fresh.next_attempt_at, "fast")
+        assert claimed_until is not None
+        assert cb.save_outbox_result(session, message_id, claimed_until, True, 0, "fast")
+        session.expire_all()
+        assert session.get(cb.OutboxMessage, message_id).sent_at is not None
+
+
+def test_drain_outbox_does_not_send_message_taken_over(run, api_session, monkeypatch):
+    taken_id, kept_id = sorted(add_outbox_messages(2))
+    with cb.Session() as session:
+        stale = [message for message in cb.claim_outbox_batch(session, 1000) if message.id in (taken_id, kept_id)]
+    # Қисм аз мӯҳлат дарозтар фиристода шуд: паёми аввал аллакай ба нусхаи дигар гузаштааст
+    expire_claims({taken_id})
+    claim("other")
+    monkeypatch.setattr(cb, "claim_outbox_batch", lambda session, limit: stale)
+
+    calls = len(api_session.calls)
+    run(cb.drain_outbox())
+    texts = [method.text for method in api_session.calls[calls:]]
+    assert texts == [stale[1].text]
+    with cb.Session() as session:
+        assert session.get(cb.OutboxMessage, taken_id).sent_at is None
+        assert session.get(cb.OutboxMessage, kept_id).sent_at is not None
+
+
+def test_catalog_change_from_other_instance_reaches_cache(run, make_product):
+    product_id = make_product(1000)
+    assert run(cb.get_catalog()).products[product_id].price_cents == 1000
+
+    with cb.Session() as session:
+        cb.update_product(session, product_id, "Product", None, 1500, None, None)
+    assert run(cb.get_catalog()).products[product_id].price_cents == 1000
+
+    run(cb.sync_caches())
+    assert run(cb.get_catalog()).products[product_id].price_cents == 1500
+
+
+def test_language_change_from_other_instance_reaches_cache(run, user_id):
+    cb.remember_language(user_id, "tj")
+    with cb.Session() as session:
+        cb.save_language(session, user_id, "ru")
+    assert cb.get_user_language(user_id) == "tj"
+
+    run(cb.sync_caches())
+    assert cb.get_user_language(user_id) == "ru"
@@ -0,0 +1,52 @@
+# EXPLAIN QUERY PLAN барои дархостҳои серистифодаи handler-ҳо: ҳар SQL-и иҷрошуда сабт ва
+# плани он санҷида мешавад, ки ҷадвал пурра (SCAN) хонда нашавад. "SCAN"-и зердархостҳо
+# (CO-ROUTINE/MATERIALIZE) иҷозат аст, чунки онҳо аз натиҷаи аллакай бо индекс филтршуда мехонанд.
+import re
+
+import pytest
+
+import chocoberry_bot as cb
+from helpers import capture_statements
+
+pytestmark = pytest.mark.skipif(cb.engine.dialect.name != "sqlite", reason="EXPLAIN QUERY PLAN танҳо дар SQLite")
+
+HOT_QUERIES = {
+    "cart_view": lambda session, user_id, product_id, cart_id: cb.load_cart_view(session, user_id),
+    "add_to_cart": lambda session, user_id, product_id, cart_id: cb.add_product_to_cart(session, user_id, product_id),
+    "cart_quantity": lambda session, user_id, product_id, cart_id: cb.update_cart_item(session, user_id, cart_id, 1),
+    "checkout_lines": lambda session, user_id, product_id, cart_id: cb.load_checkout_lines(session, user_id, [(cart_id, product_id, 1)]),
+    "order_history": lambda session, user_id, product_id, cart_id: cb.load_order_history(session, user_id),
+    "outbox": lambda session, user_id, product_id, cart_id: cb.claim_outbox_batch(session, cb.OUTBOX_BATCH_SIZE),
+    "fsm_load": lambda session, user_id, product_id, cart_id: cb.load_fsm_record(session, f"fsm:{user_id}"),
+    "fsm_save": lambda session, user_id, product_id, cart_id: cb.save_fsm_record(session, f"fsm:{user_id}", state="test"),
+}
+
+
+def full_scans(plan: list) -> list:
+    subqueries = {match.group(2) for detail in plan if (match := re.match(r"(CO-ROUTINE|MATERIALIZE) (\S+)", detail))}
+    return [
+        detail for detail in plan
+        if (match := re.match(r"SCAN (\S+)", detail)) and match.group(1) not in subqueries
+    ]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_index(name, user_id, make_product):
+    product_id = make_product(1000)
+    with cb.Session() as session:
+        cb.add_product_to_cart(session, user_id, product_id)
+        cart_id = session.query(cb.Cart.id).filter_by(telegram_id=user_id).scalar()
+
+    with cb.Session() as session, capture_statements(cb.engine) as statements:
+        HOT_QUERIES[name](session, user_id, product_id, cart_id)
+
+    plans = []
+    with cb.engine.connect() as connection:
+        for statement, parameters in statements:
+            if statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                plan = [row[3] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+                plans.append((statement, plan))
+
+    assert plans
+    for statement, plan in plans:
+        assert not full_scans(plan), f"{statement}\n{plan}"
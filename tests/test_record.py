@@ -0,0 +1,35 @@
+import json
+
+import chocoberry_bot as cb
+from testkit import callback_update, message_update
+
+
+def test_user_ids_in_callback_data_are_pseudonymized():
+    user_id = 987654321
+    for data in (f"admin_select_user_{user_id}", f"admin_add_order:n{user_id}", f"admin_add_order:p{user_id}"):
+        update = callback_update(cb.ADMIN_ID, data)
+        record = cb.anonymize_update(update)
+        prefix = data[:-len(str(user_id))]
+
+        assert record["callback_query"]["data"] == f"{prefix}{cb.pseudonymize_id(user_id)}"
+        assert str(user_id) not in json.dumps(record)
+
+
+def test_callback_data_matches_pseudonymized_sender():
+    user_id = 987654321
+    update = callback_update(user_id, f"admin_select_user_{user_id}")
+    record = cb.anonymize_update(update)
+
+    assert record["callback_query"]["data"] == f"admin_select_user_{record['callback_query']['from']['id']}"
+    assert not cb.record_leaks_ids(update, record)
+
+
+def test_other_callback_data_and_texts_are_kept():
+    record = cb.anonymize_update(callback_update(987654321, "add_to_cart_5"))
+    assert record["callback_query"]["data"] == "add_to_cart_5"
+    assert cb.anonymize_update(message_update(987654321, "+992 900 58 52 41"))["message"]["text"] == cb.RECORD_PHONE_NUMBER
+
+
+def test_unknown_callback_with_user_id_is_detected():
+    update = callback_update(987654321, "order_for_987654321")
+    assert cb.record_leaks_ids(update, cb.anonymize_update(update))
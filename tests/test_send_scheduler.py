@@ -0,0 +1,84 @@
+# Навбати ирсол (SendScheduler) бо сессияи сохта: ҳар дархост бо вақти расиданаш ба "Telegram" сабт
+# мешавад. Ҳар тест scheduler-и худро бо суръатҳои маълум месозад, на send_scheduler-и умумиро
+import asyncio
+import time
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+
+import chocoberry_bot as cb
+from testkit import FakeSession, message_update
+
+
+class TimedSession(FakeSession):
+    def __init__(self, retry_after: int = 0):
+        super().__init__()
+        self.sent = []  # (вақт, chat_id)
+        self.retry_after = retry_after
+
+    async def make_request(self, bot, method, timeout=None):
+        if self.retry_after:
+            retry_after, self.retry_after = self.retry_after, 0
+            raise TelegramRetryAfter(method, "Too Many Requests", retry_after)
+        self.sent.append((time.monotonic(), method.chat_id))
+        return await super().make_request(bot, method, timeout)
+
+
+def scheduled_bot(scheduler: cb.SendScheduler, session: TimedSession) -> Bot:
+    session.middleware(scheduler)
+    return Bot(token="123456:TEST", session=session)
+
+
+def test_retry_after_waits_and_resends(run):
+    scheduler = cb.SendScheduler(rate=1000, chat_rate=1000, chat_burst=10)
+    session = TimedSession(retry_after=1)
+    bot = scheduled_bot(scheduler, session)
+
+    started = time.monotonic()
+    run(bot.send_chat_action(chat_id=5, action="typing"))
+
+    assert [chat_id for _, chat_id in session.sent] == [5]
+    assert session.sent[0][0] - started >= 0.95
+    assert scheduler.counters == {"sent": 1, "retried": 1, "failed": 0}
+
+
+def test_messages_to_one_chat_are_spaced_by_chat_rate(run):
+    scheduler = cb.SendScheduler(rate=1000, chat_rate=20, chat_burst=1)
+    session = TimedSession()
+    bot = scheduled_bot(scheduler, session)
+
+    async def send_all():
+        await asyncio.gather(*(
+            bot.send_chat_action(chat_id=chat_id, action="typing") for chat_id in (7, 7, 7, 7, 8)
+        ))
+
+    started = time.monotonic()
+    run(send_all())
+    same_chat = [sent_at for sent_at, chat_id in session.sent if chat_id == 7]
+    other_chat, = [sent_at for sent_at, chat_id in session.sent if chat_id == 8]
+
+    assert len(same_chat) == 4
+    assert all(later - earlier >= 0.04 for earlier, later in zip(same_chat, same_chat[1:]))
+    assert other_chat - started < 0.04
+
+
+def test_group_chat_is_sent_before_queued_messages(run):
+    scheduler = cb.SendScheduler(rate=20, chat_rate=1000, chat_burst=10)
+    scheduler.global_bucket.tokens = 0
+    session = TimedSession()
+    bot = scheduled_bot(scheduler, session)
+
+    async def send_all():
+        await asyncio.gather(*(
+            bot.send_chat_action(chat_id=chat_id, action="typing") for chat_id in (11, 12, 13, cb.GROUP_CHAT_ID)
+        ))
+
+    run(send_all())
+    assert [str(chat_id) for _, chat_id in session.sent] == [str(cb.GROUP_CHAT_ID), "11", "12", "13"]
+
+
+def test_bot_session_goes_through_send_scheduler(user_id, feed, api_session):
+    sent = cb.send_scheduler.counters["sent"]
+    feed(message_update(user_id, "/start"))
+    assert list(api_session.middleware) == [cb.send_scheduler, cb.telegram_call_counter]
+    assert cb.send_scheduler.counters["sent"] > sent
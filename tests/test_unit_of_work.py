@@ -0,0 +1,45 @@
+import pytest
+
+import chocoberry_bot as cb
+from helpers import capture_statements
+from testkit import message_update
+
+pytestmark = pytest.mark.skipif(not isinstance(cb.storage, cb.DatabaseStorage), reason="FSM дар пойгоҳ нигоҳ дошта намешавад")
+
+
+def test_fsm_state_is_loaded_inside_update_session(feed, user_id, monkeypatch):
+    owners = []
+    load_fsm_record = cb.load_fsm_record
+
+    def tracking_load(session, key):
+        owners.append(getattr(cb.db_thread_state, "owner", None))
+        return load_fsm_record(session, key)
+
+    monkeypatch.setattr(cb, "load_fsm_record", tracking_load)
+    with capture_statements(cb.engine) as statements:
+        feed(message_update(user_id, "/start"))
+
+    assert owners
+    assert all(isinstance(owner, cb.UnitOfWork) for owner in owners)
+    assert len({id(owner) for owner in owners}) == 1
+    assert owners[0].handler == "start_command"
+    assert owners[0].query_count == len(statements)
+
+
+def test_empty_fsm_state_is_read_once(feed, user_id):
+    menu = cb.translate("tj", "menu")
+    feed(message_update(user_id, menu))
+    with capture_statements(cb.engine) as statements:
+        feed(message_update(user_id, menu))
+    assert not [statement for statement, _ in statements if "fsm_state" in statement]
+
+
+def test_fsm_state_survives_a_new_storage(run, feed, user_id):
+    feed(message_update(user_id, cb.translate("tj", "menu")))
+    feed(message_update(user_id, cb.translate("tj", "feedback")))
+    key = cb.StorageKey(bot_id=cb.bot.id, chat_id=user_id, user_id=user_id)
+    assert run(cb.storage.get_state(key)) == cb.FeedbackForm.feedback_text.state
+
+    # Баъди бозоғозӣ ҳолати checkout ё форма аз пойгоҳ хонда мешавад
+    assert run(cb.DatabaseStorage(cache_empty=True).get_state(key)) == cb.FeedbackForm.feedback_text.state
+    run(cb.storage.set_state(key, None))
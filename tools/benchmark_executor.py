@@ -0,0 +1,113 @@
+# Бенчмарки ҳамзамонии update-ҳо: пойгоҳ дар ҳавзи риштаҳо (run_db, реҷаи ҳозира) ё бевосита дар
+# event loop (--mode inline, рафтори пеш аз db_executor). Ҳар корбар менюро мекушояд, маҳсулот илова
+# мекунад ва сабадро мебинад; ҳамаи update-ҳо якбора ба dp.feed_raw_update дода мешаванд, мисли polling.
+# Бо --statement-delay ҳар SQL ин қадар сония интизор мешавад (пойгоҳи сусттар), бо --api-latency
+# ҳар дархост ба Bot-и сохта (таъхири шабакаи Telegram).
+#   python tools/benchmark_executor.py --users 200 --statement-delay 0.002 --api-latency 0.005
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from concurrent.futures import Executor, Future
+
+from sqlalchemy import event
+
+from benchmark_updates import prepare_environment
+from testkit import callback_update, install_fake_session, message_update, percentile
+
+
+# Функсия ҳангоми submit дар ҳамон ришта иҷро мешавад: run_in_executor event loop-ро мебандад
+class InlineExecutor(Executor):
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+def seed(cb, users: range, products: int) -> list:
+    with cb.Session() as session:
+        category = cb.add_and_commit(session, cb.Category(name=f"Benchmark {time.time_ns()}"))
+        product_ids = [
+            cb.add_and_commit(session, cb.Product(name=f"Product {index + 1}", price_cents=1000 + index, category_id=category.id)).id
+            for index in range(products)
+        ]
+        for user_id in users:
+            cb.register_user(session, cb.types.User(id=user_id, is_bot=False, first_name=f"User{user_id}"))
+            cb.save_profile(session, user_id, "900000000", "Dushanbe")
+    cb.invalidate_catalog()
+    return product_ids
+
+
+def workload(cb, users: range, product_ids: list) -> list:
+    updates = []
+    for index, user_id in enumerate(users):
+        updates += [
+            message_update(user_id, cb.translate("tj", "menu")),
+            callback_update(user_id, f"add_to_cart_{product_ids[index % len(product_ids)]}"),
+            message_update(user_id, cb.translate("tj", "cart")),
+        ]
+    return updates
+
+
+async def run_mode(cb, executor: Executor, users: range, products: int) -> dict:
+    cb.db_executor = executor
+    product_ids = seed(cb, users, products)
+    updates = workload(cb, users, product_ids)
+    latencies = []
+
+    async def feed(update):
+        started = time.perf_counter()
+        await cb.dp.feed_raw_update(cb.bot, update)
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(feed(update) for update in updates))
+    elapsed = time.perf_counter() - started
+    return {
+        "updates": len(updates),
+        "updates_per_s": len(updates) / elapsed,
+        "p50_ms": percentile(latencies, 0.5) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Ҳамзамонии update-ҳо: run_db дар ҳавзи риштаҳо ё дар event loop")
+    parser.add_argument("--users", type=int, default=200, help="корбарон; ҳар корбар 3 update мефиристад")
+    parser.add_argument("--products", type=int, default=5)
+    parser.add_argument("--statement-delay", type=float, default=0.002, help="таъхири сунъии ҳар SQL (сония)")
+    parser.add_argument("--api-latency", type=float, default=0.005, help="таъхири ҳар дархост ба Bot API (сония)")
+    parser.add_argument("--mode", choices=("both", "executor", "inline"), default="both")
+    args = parser.parse_args()
+
+    prepare_environment(None)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import chocoberry_bot as cb
+
+    # Бо таъхири сунъӣ ҳар SQL "суст" аст; сабти онҳо натиҷаро вайрон мекунад
+    logging.getLogger("aiogram.event").setLevel(logging.WARNING)
+    cb.logger.setLevel(logging.ERROR)
+    install_fake_session(cb, args.api_latency)
+    executors = {"inline": InlineExecutor(), "executor": cb.db_executor}
+    if args.statement_delay:
+        @event.listens_for(cb.engine, "before_cursor_execute")
+        def delay_statement(connection, cursor, statement, parameters, context, executemany):
+            time.sleep(args.statement_delay)
+
+    modes = ("inline", "executor") if args.mode == "both" else (args.mode,)
+    print(f"{args.users} корбар, {args.users * 3} update, SQL +{args.statement_delay * 1000:.1f} мс, "
+          f"Bot API +{args.api_latency * 1000:.1f} мс, DB_WORKERS={cb.DB_WORKERS}")
+    print(f"{'реҷа':<12}{'update/с':>10}{'p50 мс':>10}{'p99 мс':>10}")
+    for index, mode in enumerate(modes):
+        first_user = 100000 + index * args.users
+        result = await run_mode(cb, executors[mode], range(first_user, first_user + args.users), args.products)
+        print(f"{mode:<12}{result['updates_per_s']:>10.1f}{result['p50_ms']:>10.1f}{result['p99_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
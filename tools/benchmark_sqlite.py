@@ -0,0 +1,108 @@
+# Бенчмарки профилҳои SQLite (SQLITE_PROFILE): ҳар профил дар раванди алоҳида бо пойгоҳи нав иҷро мешавад,
+# чунки PRAGMA-ҳо ҳангоми import-и бот муқаррар мешаванд. Чен карда мешавад:
+#   навиштани пай дар пайи add_product_to_cart тавассути _run_in_session (навишт/с);
+#   хондани load_cart_view аз --readers ришта, вақте ки риштаи дигар бефосила менависад (хондан/с, p99).
+#   python tools/benchmark_sqlite.py --writes 2000 --duration 5
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from benchmark_executor import seed
+from benchmark_updates import prepare_environment
+from testkit import percentile
+
+PROFILES = ("legacy", "wal")
+
+
+def measure(args) -> dict:
+    prepare_environment(None)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import chocoberry_bot as cb
+
+    cb.logger.setLevel("ERROR")
+    users = range(100000, 100000 + args.users)
+    product_ids = seed(cb, users, args.products)
+
+    def write(index: int):
+        cb._run_in_session(cb.add_product_to_cart, (users[index % len(users)], product_ids[index % len(product_ids)]), {})
+
+    started = time.perf_counter()
+    for index in range(args.writes):
+        write(index)
+    writes_per_s = args.writes / (time.perf_counter() - started)
+
+    stop = threading.Event()
+    writes = []
+
+    def writer():
+        index = 0
+        while not stop.is_set():
+            write(index)
+            index += 1
+        writes.append(index)
+
+    def reader(offset: int, latencies: list):
+        index = offset
+        while not stop.is_set():
+            read_started = time.perf_counter()
+            cb._run_in_session(cb.load_cart_view, (users[index % len(users)],), {})
+            latencies.append(time.perf_counter() - read_started)
+            index += 1
+
+    latencies = [[] for _ in range(args.readers)]
+    threads = [threading.Thread(target=writer)] + [
+        threading.Thread(target=reader, args=(offset, latencies[offset])) for offset in range(args.readers)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    reads = [latency for values in latencies for latency in values]
+    return {
+        "profile": cb.SQLITE_PROFILE,
+        "writes_per_s": writes_per_s,
+        "reads_per_s": len(reads) / args.duration,
+        "read_p99_ms": percentile(reads, 0.99) * 1000,
+        "concurrent_writes_per_s": sum(writes) / args.duration,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Муқоисаи профилҳои SQLite: навишт ва хондан ҳангоми навишт")
+    parser.add_argument("--profiles", nargs="+", choices=PROFILES, default=list(PROFILES))
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--products", type=int, default=5)
+    parser.add_argument("--writes", type=int, default=2000, help="шумораи навиштҳои пай дар пай")
+    parser.add_argument("--readers", type=int, default=2, help="риштаҳои хонанда ҳангоми навишт")
+    parser.add_argument("--duration", type=float, default=5.0, help="давомнокии санҷиши хондан (сония)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(measure(args)))
+        return
+
+    rows = []
+    for profile in args.profiles:
+        command = [sys.executable, os.path.abspath(__file__), "--worker"] + [
+            f"--{name}={getattr(args, name)}" for name in ("users", "products", "writes", "readers", "duration")
+        ]
+        output = subprocess.run(
+            command, env={**os.environ, "SQLITE_PROFILE": profile}, capture_output=True, text=True, check=True,
+        ).stdout
+        rows.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"{'профил':<10}{'навишт/с':>10}{'хондан/с':>10}{'p99 мс':>9}{'навишт/с ҳангоми хондан':>25}")
+    for row in rows:
+        print(f"{row['profile']:<10}{row['writes_per_s']:>10.0f}{row['reads_per_s']:>10.0f}"
+              f"{row['read_p99_ms']:>9.1f}{row['concurrent_writes_per_s']:>25.0f}")
+
+
+if __name__ == "__main__":
+    main()
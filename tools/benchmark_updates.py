@@ -0,0 +1,200 @@
+# Бенчмарки бозпахши update-ҳо: update-ҳои сабтшуда (UPDATE_RECORD_PATH дар бот) ё сенарияи синтетикӣ
+# пай дар пай ба dp.feed_update дода мешаванд — бо пойгоҳи нав (ё нусхаи --fixture) ва Bot-и сохта,
+# ки ба шабака намеравад. Натиҷа ҷадвали давомнокии ҳар handler ва гурӯҳҳо (меню, сабад, checkout) аст.
+#   python tools/benchmark_updates.py --synthetic 50 --output baseline.json
+#   python tools/benchmark_updates.py --synthetic 50 --baseline baseline.json
+#   python tools/benchmark_updates.py --updates updates.jsonl --fixture catalog.db --baseline baseline.json
+# Бо --baseline натиҷа бо гузориши қаблӣ муқоиса мешавад; агар p50-и ягон handler аз --threshold зиёд
+# суст шавад, асбоб бо коди 1 хориҷ мешавад. Сенарияи синтетикӣ пойгоҳи холиро талаб мекунад (ID-ҳо аз 1).
+import argparse
+import asyncio
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from replay_updates import load_updates
+from testkit import callback_update, install_fake_session, message_update, percentile
+
+SCENARIO_GROUPS = {
+    "menu": ("show_menu", "show_category_products", "show_gallery_page", "view_product", "back_to_menu"),
+    "cart": ("add_to_cart", "view_cart", "increase_quantity", "decrease_quantity", "remove_from_cart"),
+    "checkout": ("confirm_order", "handle_cashback_choice", "handle_payment_method"),
+}
+
+
+def synthetic_updates(users: int, admin_id: int, products: int = 3) -> list:
+    updates = [
+        callback_update(admin_id, "admin_add_category"),
+        message_update(admin_id, "Benchmark"),
+        message_update(admin_id, "/skip"),
+    ]
+    for index in range(products):
+        updates += [
+            callback_update(admin_id, "admin_add_product"),
+            message_update(admin_id, f"Product {index + 1}"),
+            message_update(admin_id, "Benchmark product"),
+            message_update(admin_id, f"{10 + index}.50"),
+            callback_update(admin_id, "select_category_1"),
+            message_update(admin_id, "/skip"),
+        ]
+    # Сабад баъди ҳар checkout холӣ мешавад, бинобар ин ID-ҳои сатрҳои сабади ҳар корбар 1 ва 2 мебошанд
+    for user_id in range(100000, 100000 + users):
+        updates += [
+            message_update(user_id, "/start"),
+            callback_update(user_id, "set_language_en"),
+            message_update(user_id, "900000000"),
+            message_update(user_id, "Dushanbe"),
+            message_update(user_id, "🍫 Menu"),
+            callback_update(user_id, "category_1"),
+            callback_update(user_id, "view_product_1"),
+            callback_update(user_id, "add_to_cart_1"),
+            callback_update(user_id, "add_to_cart_2"),
+            message_update(user_id, "🛒 Cart"),
+            callback_update(user_id, "increase_quantity_1"),
+            callback_update(user_id, "decrease_quantity_2"),
+            callback_update(user_id, "confirm_order"),
+            callback_update(user_id, "payment_cash"),
+            message_update(user_id, "📜 Order History"),
+        ]
+    return updates
+
+
+def prepare_environment(fixture: str) -> str:
+    workdir = tempfile.mkdtemp(prefix="chocoberry-bench-")
+    database = os.path.join(workdir, "chocoberry.db")
+    if fixture:
+        shutil.copy(fixture, database)
+    os.environ["DATABASE_URL"] = f"sqlite:///{database}"
+    os.environ.setdefault("BOT_TOKEN", "123456:BENCHMARK")
+    os.environ.setdefault("ADMIN_ID", "1")
+    os.environ.setdefault("GROUP_CHAT_ID", "-100")
+    os.environ["METRICS_PORT"] = "0"
+    os.environ.pop("UPDATE_RECORD_PATH", None)
+    # Навбати ирсол кор мекунад, вале бе маҳдудияти Telegram; барои ченкунии он қиматҳоро дар муҳит диҳед
+    for name in ("SEND_RATE", "CHAT_SEND_RATE", "GROUP_SEND_RATE"):
+        os.environ.setdefault(name, "10000")
+    os.environ.setdefault("CHAT_SEND_BURST", "100")
+    os.chdir(workdir)
+    return workdir
+
+
+def summarize(samples: dict) -> dict:
+    return {
+        name: {
+            "count": len(values),
+            "mean_ms": sum(duration for duration, _ in values) * 1000 / len(values),
+            "p50_ms": percentile([duration for duration, _ in values], 0.5) * 1000,
+            "p90_ms": percentile([duration for duration, _ in values], 0.9) * 1000,
+            "p99_ms": percentile([duration for duration, _ in values], 0.99) * 1000,
+            "queries": sum(queries for _, queries in values) / len(values),
+        }
+        for name, values in samples.items() if values
+    }
+
+
+async def replay(cb, updates: list) -> tuple:
+    samples = {}
+    current = {}
+
+    # Охирин middleware-и берунӣ: номи handler ва шумораи SQL-и ҳамин update-ро мегирад
+    async def capture_handler(handler, event, data):
+        result = await handler(event, data)
+        unit_of_work = cb.current_unit_of_work.get()
+        current["handler"] = cb.current_handler_name()
+        current["queries"] = unit_of_work.query_count if unit_of_work is not None else 0
+        return result
+
+    cb.dp.update.outer_middleware(capture_handler)
+    started = time.perf_counter()
+    for update in updates:
+        current.clear()
+        update_started = time.perf_counter()
+        await cb.dp.feed_raw_update(cb.bot, update)
+        duration = time.perf_counter() - update_started
+        samples.setdefault(current.get("handler", "unhandled"), []).append((duration, current.get("queries", 0)))
+    elapsed = time.perf_counter() - started
+
+    # Вазифаҳои фонӣ (масалан таҳрири таъхирёфтаи сабад) пеш аз анҷом иҷро мешаванд
+    pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+    if pending:
+        await asyncio.wait(pending, timeout=5)
+    return samples, elapsed
+
+
+def print_table(title: str, rows: dict, baseline: dict):
+    print(f"\n{title}")
+    print(f"{'':<28}{'шумора':>8}{'миёна мс':>10}{'p50 мс':>9}{'p90 мс':>9}{'p99 мс':>9}{'SQL':>6}{'p50 Δ':>9}")
+    for name, row in sorted(rows.items(), key=lambda item: item[1]["mean_ms"] * item[1]["count"], reverse=True):
+        delta = ""
+        if name in baseline and baseline[name]["p50_ms"]:
+            delta = f"{(row['p50_ms'] / baseline[name]['p50_ms'] - 1) * 100:+.0f}%"
+        print(f"{name[:27]:<28}{row['count']:>8}{row['mean_ms']:>10.2f}{row['p50_ms']:>9.2f}{row['p90_ms']:>9.2f}"
+              f"{row['p99_ms']:>9.2f}{row['queries']:>6.1f}{delta:>9}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Бозпахши update-ҳо ба dp.feed_update ва гузориши давомнокии handler-ҳо")
+    parser.add_argument("--updates", help="файли JSONL (UPDATE_RECORD_PATH-и бот)")
+    parser.add_argument("--synthetic", type=int, default=20, help="шумораи корбарони синтетикӣ, агар --updates набошад")
+    parser.add_argument("--fixture", help="нусхаи chocoberry.db, ки пеш аз бозпахш истифода мешавад")
+    parser.add_argument("--output", help="натиҷаро ба ин файли JSON сабт кунед")
+    parser.add_argument("--baseline", help="гузориши JSON-и қаблӣ барои муқоиса")
+    parser.add_argument("--threshold", type=float, default=0.2, help="сусткунии иҷозатдодашудаи p50 (0.2 = 20%%)")
+    parser.add_argument("--min-count", type=int, default=5, help="handler-ҳои камтар аз ин дар муқоиса санҷида намешаванд")
+    args = parser.parse_args()
+
+    updates = load_updates(args.updates) if args.updates else None
+    workdir = prepare_environment(args.fixture)
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import chocoberry_bot as cb
+
+    # Сабти ҳар update вақтро мегирад ва натиҷаро вайрон мекунад
+    logging.getLogger("aiogram.event").setLevel(logging.WARNING)
+    if updates is None:
+        updates = synthetic_updates(args.synthetic, cb.ADMIN_ID)
+    session = install_fake_session(cb)
+    samples, elapsed = await replay(cb, updates)
+
+    groups = {
+        group: [sample for handler in handlers for sample in samples.get(handler, [])]
+        for group, handlers in SCENARIO_GROUPS.items()
+    }
+    report = {
+        "updates": len(updates),
+        "elapsed_s": elapsed,
+        "updates_per_s": len(updates) / elapsed,
+        "api_calls": len(session.calls),
+        "handlers": summarize(samples),
+        "groups": summarize(groups),
+    }
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    print(f"{len(updates)} update дар {elapsed:.2f} с: {report['updates_per_s']:.1f} update/с, "
+          f"{len(session.calls)} дархост ба Bot API, пойгоҳ: {workdir}")
+    print_table("Гурӯҳҳо", report["groups"], baseline.get("groups", {}))
+    print_table("Handler-ҳо", report["handlers"], baseline.get("handlers", {}))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, ensure_ascii=False, indent=2)
+
+    regressions = [
+        name for name, row in report["handlers"].items()
+        if row["count"] >= args.min_count and name in baseline.get("handlers", {})
+        and row["p50_ms"] > baseline["handlers"][name]["p50_ms"] * (1 + args.threshold)
+    ]
+    if regressions:
+        print(f"\nСусткунӣ аз {args.threshold:.0%} зиёд: {', '.join(sorted(regressions))}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
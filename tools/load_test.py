@@ -0,0 +1,141 @@
+# Генератори сарбории синтетикӣ: N корбари ҳамзамон менюро мебинанд (show_menu), маҳсулот ба сабад
+# илова мекунанд ва фармоиш медиҳанд (confirm_order -> handle_payment_method). Ҳар корбар update-и навбатиро
+# танҳо баъди анҷоми қаблӣ мефиристад; тугмаҳо аз ҷавобҳои бот (reply_markup) интихоб мешаванд.
+#
+# Асбоб сервери сохтаи Bot API-ро аз replay_updates.py (бо --latency, --jitter, --rate-limit) оғоз мекунад.
+# Ботро дар реҷаи webhook бо WEBHOOK_BACKGROUND=0 оғоз кунед, то ҷавоби POST баъди анҷоми handler ояд
+# ва давомнокии ҳар update дуруст чен карда шавад:
+#   BOT_MODE=webhook WEBHOOK_BACKGROUND=0 WEBHOOK_SECRET=s3cret ADMIN_ID=1 \
+#   TELEGRAM_API_URL=http://127.0.0.1:8081 python chocoberry_bot.py
+#   python tools/load_test.py --users 50 --secret s3cret --latency 0.05 --rate-limit 0.01
+# Пеш аз сарборӣ админ (--admin-id) як категория ва --products маҳсулот месозад.
+import argparse
+import asyncio
+import random
+import time
+
+from aiohttp import ClientSession
+
+from replay_updates import FakeBotApi, add_fake_api_arguments, create_fake_api, start_fake_api, wait_for_webhook
+from testkit import callback_update, message_update, percentile
+
+
+class LoadClient:
+    def __init__(self, api: FakeBotApi, session: ClientSession, url: str, secret: str):
+        self.api = api
+        self.session = session
+        self.url = url
+        self.headers = {"X-Telegram-Bot-Api-Secret-Token": secret}
+        self.latencies = {}  # қадам -> [сония]
+        self.failures = 0
+
+    async def send(self, step: str, update: dict, user_id: int) -> list:
+        self.api.buttons.pop(user_id, None)
+        started = time.perf_counter()
+        async with self.session.post(self.url, json=update, headers=self.headers) as response:
+            await response.read()
+            if response.status != 200:
+                self.failures += 1
+        self.latencies.setdefault(step, []).append(time.perf_counter() - started)
+        return self.api.buttons.pop(user_id, [])
+
+    async def text(self, step: str, user_id: int, text: str) -> list:
+        return await self.send(step, message_update(user_id, text), user_id)
+
+    async def tap(self, step: str, user_id: int, data: str) -> list:
+        return await self.send(step, callback_update(user_id, data), user_id)
+
+
+def find_buttons(buttons: list, prefix: str) -> list:
+    return [data for _, data in buttons if data.startswith(prefix)]
+
+
+async def seed_catalog(client: LoadClient, admin_id: int, products: int):
+    category = f"Load {int(time.time())}"
+    await client.tap("seed", admin_id, "admin_add_category")
+    await client.text("seed", admin_id, category)
+    await client.text("seed", admin_id, "/skip")
+    for index in range(products):
+        await client.tap("seed", admin_id, "admin_add_product")
+        await client.text("seed", admin_id, f"Load product {index + 1}")
+        await client.text("seed", admin_id, "Synthetic load test product")
+        buttons = await client.text("seed", admin_id, f"{10 + index}.50")
+        selected = [data for text, data in buttons if text == category]
+        if not selected:
+            raise RuntimeError("Категорияи сохташуда дар рӯйхати интихоб нест")
+        await client.tap("seed", admin_id, selected[0])
+        await client.text("seed", admin_id, "/skip")
+
+
+async def simulate_user(client: LoadClient, user_id: int, cart_items: int, orders: int, rng: random.Random) -> int:
+    await client.text("start", user_id, "/start")
+    await client.tap("set_language", user_id, "set_language_en")
+    await client.text("process_phone", user_id, f"9{user_id:08d}"[-9:])
+    await client.text("process_address", user_id, "Dushanbe")
+
+    completed = 0
+    for _ in range(orders):
+        for _ in range(cart_items):
+            products = find_buttons(await client.text("show_menu", user_id, "🍫 Menu"), "view_product_")
+            if not products:
+                return completed
+            add_buttons = find_buttons(await client.tap("view_product", user_id, rng.choice(products)), "add_to_cart_")
+            if add_buttons:
+                await client.tap("add_to_cart", user_id, add_buttons[0])
+
+        await client.text("view_cart", user_id, "🛒 Cart")
+        buttons = await client.tap("confirm_order", user_id, "confirm_order")
+        if find_buttons(buttons, "skip_cashback"):
+            buttons = await client.tap("handle_cashback_choice", user_id, "skip_cashback")
+        if not find_buttons(buttons, "payment_cash"):
+            continue
+        await client.tap("handle_payment_method", user_id, "payment_cash")
+        completed += 1
+    return completed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Сарбории синтетикӣ: меню, сабад ва фармоиш аз ҷониби N корбар")
+    parser.add_argument("--users", type=int, default=20, help="шумораи корбарони ҳамзамон")
+    parser.add_argument("--cart-items", type=int, default=2, help="маҳсулот дар ҳар фармоиш")
+    parser.add_argument("--orders", type=int, default=1, help="фармоишҳои ҳар корбар")
+    parser.add_argument("--products", type=int, default=5, help="маҳсулоте, ки админ пеш аз сарборӣ месозад")
+    parser.add_argument("--admin-id", type=int, default=1)
+    parser.add_argument("--first-user-id", type=int, default=100000)
+    parser.add_argument("--webhook-url", default="http://127.0.0.1:8080/webhook")
+    parser.add_argument("--secret", default="")
+    add_fake_api_arguments(parser)
+    args = parser.parse_args()
+
+    api = create_fake_api(args, [], polling=False)
+    runner = await start_fake_api(api, args.api_port)
+    print(f"Bot API дар http://127.0.0.1:{args.api_port}, {args.users} корбар, webhook: {args.webhook_url}")
+
+    async with ClientSession() as session:
+        await wait_for_webhook(session, args.webhook_url)
+        client = LoadClient(api, session, args.webhook_url, args.secret)
+        await seed_catalog(client, args.admin_id, args.products)
+        client.latencies.clear()
+        calls_before, rate_limited_before = api.calls, api.rate_limited
+
+        started = time.perf_counter()
+        completed = await asyncio.gather(*(
+            simulate_user(client, user_id, args.cart_items, args.orders, random.Random(args.seed + user_id))
+            for user_id in range(args.first_user_id, args.first_user_id + args.users)
+        ))
+        elapsed = time.perf_counter() - started
+
+    await runner.cleanup()
+    total = sum(len(values) for values in client.latencies.values())
+    every = [value for values in client.latencies.values() for value in values]
+    print(f"{total} update дар {elapsed:.2f} с: {total / elapsed:.1f} update/с, фармоишҳо: {sum(completed)}, "
+          f"хатоҳои HTTP: {client.failures}, дархост ба API: {api.calls - calls_before}, "
+          f"ҷавоби 429: {api.rate_limited - rate_limited_before}")
+    print(f"{'қадам':<24}{'шумора':>8}{'p50 мс':>9}{'p90 мс':>9}{'p99 мс':>9}{'max мс':>9}")
+    for step, values in list(client.latencies.items()) + [("ҳама", every)]:
+        print(f"{step:<24}{len(values):>8}{percentile(values, 0.5) * 1000:>9.1f}{percentile(values, 0.9) * 1000:>9.1f}"
+              f"{percentile(values, 0.99) * 1000:>9.1f}{max(values) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,201 @@
+# Бозпахши update-ҳои сабтшуда ба бот тавассути HTTP ва ченкунии update/сония.
+#
+# Асбоб сервери сохтаи Bot API-ро (--api-port) оғоз мекунад, ки ҳамаи дархостҳои ботро қабул мекунад.
+# Ботро бо TELEGRAM_API_URL=http://127.0.0.1:<api-port> оғоз кунед:
+#   polling: BOT_MODE=polling — update-ҳо ба бот тавассути getUpdates дода мешаванд;
+#   webhook: BOT_MODE=webhook WEBHOOK_SECRET=... — update-ҳо ба --webhook-url POST карда мешаванд.
+# Update-ҳо аз файли JSONL (--updates, як Update дар ҳар сатр) ё синтетикӣ (--synthetic N корбар).
+# Вақт аз аввалин update то охирин дархости бот ба API ҳисоб мешавад.
+# Барои ченкунии худи коркард маҳдудиятҳои ирсолро баланд кунед (SEND_RATE, CHAT_SEND_RATE, CHAT_SEND_BURST).
+# Сервер метавонад таъхири шабака (--latency, --jitter) ва ҷавобҳои 429 (--rate-limit) -ро тақлид кунад.
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+
+from aiohttp import ClientSession, web
+
+from testkit import callback_update, message_update
+
+MESSAGE_RESULT_METHODS = {"sendmediagroup"}
+TRUE_RESULT_METHODS = {
+    "answercallbackquery", "setwebhook", "deletewebhook", "setmycommands",
+    "deletemessage", "sendchataction",
+}
+# Ба ин методҳо ҷавоби 429 дода мешавад (мисли маҳдудиятҳои ирсоли Telegram)
+RATE_LIMITED_PREFIXES = ("send", "edit", "copy", "forward")
+
+
+def synthetic_updates(users: int) -> list:
+    updates = []
+    for user_id in range(1000, 1000 + users):
+        updates.append(message_update(user_id, "/start"))
+        updates.append(callback_update(user_id, "set_language_en"))
+        updates.append(message_update(user_id, "900000000"))
+        updates.append(message_update(user_id, "Dushanbe"))
+        updates.append(message_update(user_id, "🍫 Menu"))
+    return updates
+
+
+def load_updates(path: str) -> list:
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+class FakeBotApi:
+    def __init__(self, updates: list, polling: bool, latency: float = 0.0, jitter: float = 0.0,
+                 rate_limit: float = 0.0, retry_after: int = 1, seed: int = 0):
+        self.pending = list(updates) if polling else []
+        self.calls = 0
+        self.rate_limited = 0
+        self.first_delivery = None
+        self.last_call = None
+        self.message_ids = itertools.count(1)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.random = random.Random(seed)
+        self.buttons = {}  # chat_id -> [(матн, callback_data)] аз паёмҳои бот
+
+    def message(self, chat_id, text=None) -> dict:
+        return {
+            "message_id": next(self.message_ids),
+            "date": int(time.time()),
+            "chat": {"id": int(chat_id or 0), "type": "private"},
+            "text": text,
+        }
+
+    def remember_buttons(self, params: dict):
+        markup = json.loads(params.get("reply_markup") or "null") or {}
+        buttons = [
+            (button.get("text"), button["callback_data"])
+            for row in markup.get("inline_keyboard", [])
+            for button in row
+            if "callback_data" in button
+        ]
+        if buttons and params.get("chat_id"):
+            self.buttons.setdefault(int(params["chat_id"]), []).extend(buttons)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"].lower()
+        params = dict(await request.post()) if request.can_read_body else {}
+        if method == "getupdates":
+            offset = int(params.get("offset") or 0)
+            self.pending = [update for update in self.pending if update["update_id"] >= offset]
+            batch = self.pending[:100]
+            if batch and self.first_delivery is None:
+                self.first_delivery = time.monotonic()
+            if not batch:
+                await asyncio.sleep(0.05)
+            return web.json_response({"ok": True, "result": batch})
+
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.random.uniform(0, self.jitter))
+        if self.rate_limit and method.startswith(RATE_LIMITED_PREFIXES) and self.random.random() < self.rate_limit:
+            self.rate_limited += 1
+            return web.json_response({
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.retry_after}",
+                "parameters": {"retry_after": self.retry_after},
+            }, status=429)
+
+        self.calls += 1
+        self.last_call = time.monotonic()
+        self.remember_buttons(params)
+        if method == "getme":
+            result = {"id": 1, "is_bot": True, "first_name": "ChocoBerry", "username": "chocoberry_bot"}
+        elif method in TRUE_RESULT_METHODS:
+            result = True
+        elif method in MESSAGE_RESULT_METHODS:
+            media = json.loads(params.get("media", "[]"))
+            result = [self.message(params.get("chat_id")) for _ in media]
+        else:
+            result = self.message(params.get("chat_id"), params.get("text"))
+        return web.json_response({"ok": True, "result": result})
+
+
+async def wait_for_webhook(session: ClientSession, url: str):
+    while True:
+        try:
+            async with session.get(url) as response:
+                if response.status < 500:
+                    return
+        except OSError:
+            pass
+        await asyncio.sleep(0.2)
+
+
+async def start_fake_api(api: FakeBotApi, port: int) -> web.AppRunner:
+    app = web.Application()
+    app.router.add_post("/bot{token}/{method}", api.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+
+def add_fake_api_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--api-port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.0, help="таъхири ҳар дархост ба API, сония")
+    parser.add_argument("--jitter", type=float, default=0.0, help="таъхири тасодуфии иловагӣ то ин қадар сония")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="ҳиссаи дархостҳои ирсол, ки 429 мегиранд (0..1)")
+    parser.add_argument("--retry-after", type=int, default=1, help="retry_after дар ҷавоби 429")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def create_fake_api(args, updates: list, polling: bool) -> FakeBotApi:
+    return FakeBotApi(updates, polling, args.latency, args.jitter, args.rate_limit, args.retry_after, args.seed)
+
+
+async def post_updates(api: FakeBotApi, updates: list, url: str, secret: str, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret}
+    async with ClientSession() as session:
+        await wait_for_webhook(session, url)
+
+        async def post(update):
+            async with semaphore:
+                async with session.post(url, json=update, headers=headers) as response:
+                    if response.status != 200:
+                        print(f"update {update['update_id']}: HTTP {response.status}")
+
+        api.first_delivery = time.monotonic()
+        await asyncio.gather(*(post(update) for update in updates))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Бозпахши update-ҳо ба бот ва ченкунии update/сония")
+    parser.add_argument("--mode", choices=("polling", "webhook"), default="polling")
+    parser.add_argument("--updates", help="файли JSONL бо update-ҳо")
+    parser.add_argument("--synthetic", type=int, default=50, help="шумораи корбарони синтетикӣ, агар --updates набошад")
+    parser.add_argument("--webhook-url", default="http://127.0.0.1:8080/webhook")
+    parser.add_argument("--secret", default="")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--idle", type=float, default=2.0, help="сонияҳои бекорӣ баъд аз охирин дархост")
+    add_fake_api_arguments(parser)
+    args = parser.parse_args()
+
+    updates = load_updates(args.updates) if args.updates else synthetic_updates(args.synthetic)
+    api = create_fake_api(args, updates, polling=args.mode == "polling")
+    runner = await start_fake_api(api, args.api_port)
+    print(f"Bot API дар http://127.0.0.1:{args.api_port}, {len(updates)} update, реҷа: {args.mode}")
+
+    if args.mode == "webhook":
+        await post_updates(api, updates, args.webhook_url, args.secret, args.concurrency)
+    else:
+        while api.first_delivery is None or api.pending:
+            await asyncio.sleep(0.1)
+
+    while api.last_call is None or time.monotonic() - api.last_call < args.idle:
+        await asyncio.sleep(0.1)
+    elapsed = api.last_call - api.first_delivery
+    print(f"{len(updates)} update дар {elapsed:.2f} с: {len(updates) / elapsed:.1f} update/с, {api.calls} дархост ба API, {api.rate_limited} ҷавоби 429")
+    await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+# Ёрдамчиҳои умумии асбобҳо ва тестҳо: update-ҳои сохтаи Telegram, сессияи сохтаи Bot API (бе шабака)
+# ва персентил. Асбобҳо аз tools/ иҷро мешаванд; тестҳо tools/-ро ба sys.path илова мекунанд.
+import asyncio
+import itertools
+import time
+from datetime import datetime
+
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import SendMediaGroup
+from aiogram.types import Chat, Message
+
+update_ids = itertools.count(1)
+
+
+def message_update(user_id: int, text: str, update_id: int = None) -> dict:
+    update_id = next(update_ids) if update_id is None else update_id
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": f"User{user_id}"},
+            "text": text,
+        },
+    }
+
+
+def callback_update(user_id: int, data: str, update_id: int = None) -> dict:
+    update_id = next(update_ids) if update_id is None else update_id
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "from": {"id": user_id, "is_bot": False, "first_name": f"User{user_id}"},
+            "chat_instance": str(user_id),
+            "data": data,
+            "message": {
+                "message_id": 1,
+                "date": int(time.time()),
+                "chat": {"id": user_id, "type": "private"},
+                "text": "-",
+            },
+        },
+    }
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+# Bot ба шабака намеравад: ҳар дархост сабт шуда, баъди latency ҷавоби сохта мегирад
+class FakeSession(BaseSession):
+    def __init__(self, latency: float = 0.0):
+        super().__init__()
+        self.latency = latency
+        self.calls = []
+        self.message_ids = itertools.count(1)
+
+    async def make_request(self, bot, method, timeout=None):
+        self.calls.append(method)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        def message():
+            return Message(
+                message_id=next(self.message_ids),
+                date=datetime.now(),
+                chat=Chat(id=int(getattr(method, "chat_id", None) or 1), type="private"),
+                text=getattr(method, "text", None),
+            )
+
+        if isinstance(method, SendMediaGroup):
+            return [message() for _ in method.media]
+        if "Message" in str(method.__returning__):
+            return message()
+        return True
+
+    async def stream_content(self, *args, **kwargs):
+        yield b""
+
+    async def close(self):
+        pass
+
+
+def install_fake_session(cb, latency: float = 0.0):
+    # Тавассути install_bot_session, то навбати ирсол ва ҳисобкунаки дархостҳо дар сессияи сохта ҳам кор кунанд
+    session = FakeSession(latency)
+    cb.install_bot_session(session)
+    return session